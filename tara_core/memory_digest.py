@@ -0,0 +1,198 @@
+# tara_core/memory_digest.py
+
+import json
+import os
+from datetime import datetime, timedelta
+
+DIGEST_FILE = os.path.join("tara_data", "memory_digest.json") # Read position and hour digests, stored alongside memory_log.jsonl
+DAY_DIGEST_DIR = os.path.join("tara_data", "daily_digests") # One YYYY-MM-DD.json per day, so an event only rewrites its own day
+HOUR_RETENTION_DAYS = 7 # Hour digests older than this are dropped; day digests are kept
+MAX_TOPICS = 10 # Most recent conversation topics kept per hour/day bucket
+
+# Tools whose calls are worth telling the user about, mapped to the digest field they fill
+# and the start of the result AssistantTasks returns when the call succeeded.
+# Anything else (lookups, Gemini round-trip telemetry, fallbacks) is left out of digests.
+TOOL_DIGEST_FIELDS = {
+    "add_todo": ("tasks_added", "Okay, I've added"),
+    "remove_todo": ("tasks_removed", "I've removed"),
+    "call_person": ("calls", "Attempting to call"),
+    "send_message": ("messages", "Sending message to"),
+    "set_reminder": ("reminders", "Okay, I've set a reminder"),
+    "play_music": ("music", "Certainly, playing"),
+}
+
+# Tools that only look things up in TARA's memory; the commands behind them are questions, not activity.
+MEMORY_LOOKUP_TOOLS = {"get_recent_events", "search_events", "semantic_search_events", "get_activity_digest"}
+
+
+class MemoryDigest:
+    """
+    Rolls memory events up into compact per-hour and per-day digests of
+    user-meaningful activity, so "what did I do today?" can be answered
+    without sending raw events back to Gemini.
+
+    Hour digests for the last HOUR_RETENTION_DAYS live in one small state file;
+    day digests get a file each, so the cost of a new event doesn't grow with
+    the length of the history.
+    """
+
+    def __init__(self, log_file, digest_file=DIGEST_FILE, day_dir=DAY_DIGEST_DIR):
+        self.log_file = log_file
+        self.digest_file = digest_file
+        self.day_dir = day_dir
+        self.hours = {} # "YYYY-MM-DDTHH" -> digest
+        self.digested_bytes = 0 # How far into the log we've read
+        self.pending_topic = None # [timestamp, command] of the current turn, until we know it wasn't a tool request
+
+        os.makedirs(day_dir, exist_ok=True)
+        self._load()
+        self.sync()
+        print("MemoryDigest initialized.")
+
+    @staticmethod
+    def _summarize(event):
+        """Returns (field, value) for a successful action tool call, or None for anything else."""
+        data = event.get("data") or {}
+        field, success_prefix = TOOL_DIGEST_FIELDS.get(data.get("function_name"), (None, None))
+        if field is None or not str(data.get("result") or "").startswith(success_prefix):
+            return None # The tool refused or failed, e.g. "I couldn't find any item containing 'milk'"
+        args = {key: str(value).strip() for key, value in (data.get("args") or {}).items() if value is not None}
+        if field == "tasks_added":
+            value = args.get("item")
+        elif field == "tasks_removed":
+            value = args.get("item_keyword")
+        elif field == "calls":
+            value = args.get("person_name")
+        elif field == "messages":
+            value = f"to {args['person_name']}: {args['message']}" if args.get("person_name") and args.get("message") else None
+        elif field == "reminders":
+            value = f"{args['time']}: {args['message']}" if args.get("time") and args.get("message") else None
+        else:
+            value = args.get("genre") or "music"
+        return (field, value) if value else None
+
+    @staticmethod
+    def _add(digest, field, value):
+        values = digest.setdefault(field, [])
+        if field == "topics":
+            if value in values:
+                values.remove(value) # Keep the most recent mention last
+            values.append(value)
+            del values[:-MAX_TOPICS]
+        else:
+            values.append(value)
+
+    def sync(self):
+        """
+        Folds any lines appended to the log since the last call into the digests.
+        Returns the number of user-meaningful events added.
+        """
+        if not os.path.exists(self.log_file):
+            return 0
+        if os.path.getsize(self.log_file) < self.digested_bytes:
+            print("WARNING(MemoryDigest): Memory log shrank, rebuilding digests.")
+            self._reset()
+            for name in os.listdir(self.day_dir):
+                os.remove(os.path.join(self.day_dir, name))
+
+        added = 0
+        days = {} # Day digests touched by this sync
+        try:
+            with open(self.log_file, 'rb') as f:
+                f.seek(self.digested_bytes)
+                for line in f:
+                    if not line.endswith(b'\n'):
+                        break # Line is still being written
+                    self.digested_bytes += len(line)
+                    try:
+                        event = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue # search_events already warns about corrupted lines
+                    event_type = event.get("type")
+                    data = event.get("data") or {}
+                    timestamp = event.get("timestamp") or ""
+                    summary = None
+                    if event_type == "user_command":
+                        command = (data.get("command") or "").strip()
+                        self.pending_topic = [timestamp, command] if command else None
+                    elif event_type == "tool_executed":
+                        # Requests and questions about memory are covered by their tool (or aren't activity at all),
+                        # so only commands that ended in plain conversation become topics.
+                        self.pending_topic = None
+                        summary = self._summarize(event)
+                    elif event_type == "tara_response" and self.pending_topic:
+                        if not data.get("exit_triggered"):
+                            timestamp, command = self.pending_topic
+                            summary = ("topics", command)
+                        self.pending_topic = None
+                    if summary is None or len(timestamp) < 13:
+                        continue
+                    field, value = summary
+                    self._add(self.hours.setdefault(timestamp[:13], {}), field, value)
+                    if timestamp[:10] not in days:
+                        days[timestamp[:10]] = self._load_day(timestamp[:10])
+                    self._add(days[timestamp[:10]], field, value)
+                    added += 1
+        except Exception as e:
+            print(f"ERROR(MemoryDigest): Failed to digest memory log: {e}")
+
+        if added:
+            # Only persist when a digest changed; skipped telemetry is cheap to re-read.
+            # Day files go first, so a crash in between re-reads events rather than losing them.
+            for day, digest in days.items():
+                self._write_json(os.path.join(self.day_dir, f"{day}.json"), digest)
+            cutoff = (datetime.now() - timedelta(days=HOUR_RETENTION_DAYS)).strftime("%Y-%m-%dT%H")
+            self.hours = {hour: digest for hour, digest in self.hours.items() if hour >= cutoff}
+            self._write_json(self.digest_file, {"digested_bytes": self.digested_bytes,
+                                                "pending_topic": self.pending_topic, "hours": self.hours})
+        return added
+
+    def get(self, period="day", count=1):
+        """
+        Returns digests for the last `count` calendar hours or days up to and including
+        the current one, oldest first. Periods without activity only have a "period" key.
+        """
+        now = datetime.now()
+        if period == "hour":
+            count = min(count, HOUR_RETENTION_DAYS * 24)
+            hours = [(now - timedelta(hours=back)).strftime("%Y-%m-%dT%H") for back in reversed(range(count))]
+            return [{"period": hour, **self.hours.get(hour, {})} for hour in hours]
+        days = [(now - timedelta(days=back)).strftime("%Y-%m-%d") for back in reversed(range(count))]
+        return [{"period": day, **self._load_day(day)} for day in days]
+
+    def _reset(self):
+        self.hours, self.digested_bytes, self.pending_topic = {}, 0, None
+
+    def _load_day(self, day):
+        path = os.path.join(self.day_dir, f"{day}.json")
+        if not os.path.exists(path):
+            return {}
+        try:
+            with open(path, 'r') as f:
+                return json.load(f)
+        except Exception as e:
+            print(f"WARNING(MemoryDigest): Could not read {path}, starting that day over: {e}")
+            return {}
+
+    def _load(self):
+        if not os.path.exists(self.digest_file):
+            return
+        try:
+            with open(self.digest_file, 'r') as f:
+                state = json.load(f)
+            self.hours = state["hours"]
+            self.digested_bytes = state["digested_bytes"]
+            self.pending_topic = state.get("pending_topic")
+        except Exception as e:
+            print(f"WARNING(MemoryDigest): Could not load {self.digest_file}, rebuilding: {e}")
+            self._reset()
+
+    @staticmethod
+    def _write_json(path, data):
+        try:
+            tmp_file = path + ".tmp"
+            with open(tmp_file, 'w') as f:
+                json.dump(data, f)
+            os.replace(tmp_file, path)
+        except Exception as e:
+            print(f"ERROR(MemoryDigest): Failed to save {path}: {e}")
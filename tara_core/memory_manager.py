@@ -4,11 +4,16 @@ import json
 import os
 from datetime import datetime
 
+from tara_core.memory_digest import MemoryDigest
+from tara_core.semantic_index import SemanticIndex
+
 MEMORY_FILE = os.path.join("tara_data", "memory_log.jsonl") # JSON Lines file
 
 class MemoryManager:
     def __init__(self):
         os.makedirs("tara_data", exist_ok=True) # Ensure data directory exists
+        self._semantic_index = SemanticIndex(MEMORY_FILE) # Catches up on any events logged since the last run
+        self._digest = MemoryDigest(MEMORY_FILE)
         print("MemoryManager initialized.")
 
     def log_event(self, event_type, data):
@@ -29,6 +34,9 @@ class MemoryManager:
             print(f"DEBUG(Memory): Logged event: {event_type}") # MODIFIED DEBUG PRINT
         except Exception as e:
             print(f"ERROR(Memory): Failed to log event: {e}") # MODIFIED DEBUG PRINT
+            return
+        self._semantic_index.sync() # Index the new line so it is searchable right away
+        self._digest.sync()
 
     def get_recent_events(self, count=5):
         """Retrieves the most recent events from the log."""
@@ -79,4 +87,35 @@ class MemoryManager:
             return matching_events
         except Exception as e:
             print(f"ERROR(Memory): Error reading memory file for search: {e}") # MODIFIED DEBUG
-            return []
\ No newline at end of file
+            return []
+
+    def semantic_search_events(self, query, limit=5):
+        """
+        Finds the events most similar in meaning to a natural-language query,
+        even when they are phrased differently from the query.
+        """
+        try:
+            limit = int(limit) if isinstance(limit, (int, float)) and limit > 0 else 5
+            results = self._semantic_index.search(query or "", limit)
+            matching_events = [{**event, "similarity": round(score, 3)} for score, event in results]
+            print(f"DEBUG(Memory): semantic_search_events returning {len(matching_events)} events for query '{query}': {matching_events}")
+            return matching_events
+        except Exception as e:
+            print(f"ERROR(Memory): Error during semantic search: {e}")
+            return []
+
+    def get_activity_digest(self, period="day", count=1):
+        """
+        Returns compact summaries of what the user did over the last `count` calendar
+        days (or hours), counting the current one: tasks added/removed, calls, messages,
+        reminders, music and topics raised. Internal telemetry events are left out.
+        """
+        try:
+            period = "hour" if period == "hour" else "day"
+            count = int(count) if isinstance(count, (int, float)) and count > 0 else 1
+            digests = self._digest.get(period, count)
+            print(f"DEBUG(Memory): get_activity_digest returning {len(digests)} {period} digests: {digests}")
+            return digests
+        except Exception as e:
+            print(f"ERROR(Memory): Error reading activity digests: {e}")
+            return []
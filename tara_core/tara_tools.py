@@ -107,7 +107,7 @@ def get_tara_tools():
                 },
                 {
                     "name": "get_recent_events",
-                    "description": "Retrieves and summarizes the most recent events, activities, or interactions from TARA's memory log. Use this when the user asks about 'recent actions', 'what happened lately', 'our last few conversations', 'summarize recent activity', or 'what did I ask a moment/few minutes ago'.",
+                    "description": "Retrieves the most recent raw events from TARA's memory log, including internal ones. Use this only when the user asks about the last few exchanges in detail (e.g., 'what did I ask a moment ago'). For questions about their day or recent activity, use get_activity_digest instead.",
                     "parameters": {
                         "type": "object",
                         "properties": {
@@ -115,6 +115,17 @@ def get_tara_tools():
                         }
                     }
                 },
+                {
+                    "name": "get_activity_digest",
+                    "description": "Retrieves compact summaries of the user's activity (tasks added or removed, calls made, messages sent, reminders set, music played, and topics they talked about), grouped by calendar day or hour. Periods are counted back from now, so count=1 with period 'day' is always today; a period with no activity comes back with only its 'period' field. Use this when the user asks about their day, 'what happened lately', 'what did I do this morning', 'summarize recent activity', or 'what have we done this week'.",
+                    "parameters": {
+                        "type": "object",
+                        "properties": {
+                            "period": {"type": "string", "enum": ["day", "hour"], "description": "Whether to summarize by 'day' or by 'hour'. Default is 'day'.", "nullable": True},
+                            "count": {"type": "number", "description": "How many days or hours to return, counting back from the current one (e.g., 2 days is yesterday and today). Default is 1. Hours only go back 7 days.", "nullable": True}
+                        }
+                    }
+                },
                 {
                     "name": "search_events",
                     "description": "Searches TARA's memory log for past events containing specific keywords or phrases. Use this when the user asks about a specific past task, reminder, or conversation (e.g., 'tell me about the call I made', 'did I add anything about groceries', 'what about the medicine reminder', 'what did I ask about X').",
@@ -126,6 +137,18 @@ def get_tara_tools():
                         },
                         "required": ["query_keywords"]
                     }
+                },
+                {
+                    "name": "semantic_search_events",
+                    "description": "Finds past events in TARA's memory log that are similar in meaning to a natural-language question, even if they use different words. Prefer this over search_events when the user asks a question in their own words (e.g., 'did I talk to my daughter about the pharmacy?', 'when did I last mention my knee?'), instead of guessing several keyword lists.",
+                    "parameters": {
+                        "type": "object",
+                        "properties": {
+                            "query": {"type": "string", "description": "The user's question or a short description of what to look for, in plain language."},
+                            "limit": {"type": "number", "description": "The maximum number of similar events to return. Default is 5.", "nullable": True}
+                        },
+                        "required": ["query"]
+                    }
                 }
             ]
         }
@@ -44,7 +44,7 @@ class VoiceInterface:
         7.  **Confirmation:** For critical actions like adding/removing items or making calls, confirm understanding if there's ambiguity, but generally proceed if the intent is clear.
         8.  **Proactive Assistance (Limited for now):** While you can't initiate actions on your own yet, respond helpfully to requests.
         9.  **Exit:** If the user says "goodbye", "quit", or "exit", respond warmly and indicate that you are ending the session.
-        10. **Memory Management:** Use the provided tools to manage your memory. For example, if the user asks about recent events, use the get_recent_events tool. If they ask about a specific past event, use the search_events tool.
+        10. **Memory Management:** Use the provided tools to manage your memory. For example, if the user asks about their day or recent activity, use the get_activity_digest tool. If they ask about a specific past event, use the semantic_search_events tool with their question; use search_events only for exact keywords.
         """
 
         # --- Configure Gemini ---